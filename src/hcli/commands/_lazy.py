@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import importlib
+
+import rich_click as click
+
+
+class LazyGroup(click.RichGroup):
+    """Rich Click Group that imports its subcommands only when they are resolved.
+
+    `lazy_subcommands` maps a command name to `(module path, attribute name)`,
+    like: `{"login": ("hcli.commands.login", "login")}`.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, tuple[str, str]] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands: dict[str, tuple[str, str]] = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            self.commands[cmd_name] = self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        module_name, attr_name = self.lazy_subcommands[cmd_name]
+        module = importlib.import_module(module_name)
+        command = getattr(module, attr_name)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"lazy command '{cmd_name}' is not a click command: {module_name}.{attr_name}")
+        return command
@@ -2,19 +2,18 @@ from __future__ import annotations
 
 import rich_click as click
 
+from hcli.commands._lazy import LazyGroup
 
-@click.group()
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "add": ("hcli.commands.ke.ida.add", "add"),
+        "remove": ("hcli.commands.ke.ida.remove", "remove"),
+        "list": ("hcli.commands.ke.ida.list", "list_instances"),
+        "switch": ("hcli.commands.ke.ida.switch", "switch"),
+    },
+)
 def ida() -> None:
     """Manage IDA Pro instances."""
     pass
-
-
-from .add import add  # noqa: E402
-from .list import list_instances  # noqa: E402
-from .remove import remove  # noqa: E402
-from .switch import switch  # noqa: E402
-
-ida.add_command(add)
-ida.add_command(remove)
-ida.add_command(list_instances, name="list")
-ida.add_command(switch)
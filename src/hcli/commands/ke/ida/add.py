@@ -2,21 +2,21 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import questionary
 import rich_click as click
-from rich.console import Console
-from rich.table import Table
 
 from hcli.lib.config import config_store
+from hcli.lib.console import console
 from hcli.lib.ida import add_instance_to_config, find_standard_installations, generate_instance_name, is_ida_dir
 
-console = Console()
-
 
 @click.command()
 @click.option("--auto", is_flag=True, help="Automatically discover standard IDA installations")
 @click.argument("name", required=False)
-@click.argument("path", type=click.Path(exists=True, path_type=Path), required=False)
+@click.argument(
+    "path",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True, path_type=Path),
+    required=False,
+)
 def add(auto: bool, name: str | None, path: Path | None) -> None:
     """Add an IDA Pro instance.
 
@@ -42,6 +42,9 @@ def add(auto: bool, name: str | None, path: Path | None) -> None:
 
 def _add_auto_discovered_instances() -> None:
     """Auto-discover and add IDA installations."""
+    import questionary
+    from rich.table import Table
+
     console.print("[blue]Discovering standard IDA installations...[/blue]")
 
     try:
@@ -75,8 +78,9 @@ def _add_auto_discovered_instances() -> None:
     table.add_column("Installation Path", style="white")
     table.add_column("Status", style="green")
 
+    registered_names = {Path(p).name for p in instances.values()}
     for i, installation in enumerate(valid_installations, 1):
-        status = "Already registered" if installation.name in [Path(p).name for p in instances.values()] else "New"
+        status = "Already registered" if installation.name in registered_names else "New"
         table.add_row(str(i), str(installation), status)
 
     console.print(table)
@@ -137,16 +141,7 @@ def _add_auto_discovered_instances() -> None:
 
 def _add_manual_instance(name: str, path: Path) -> None:
     """Add a specific IDA instance manually."""
-    path = path.expanduser().resolve()
-
-    if not path.exists():
-        console.print(f"[red]Path does not exist: {path}[/red]")
-        raise click.Abort()
-
-    if not path.is_dir():
-        console.print(f"[red]Path is not a directory: {path}[/red]")
-        raise click.Abort()
-
+    # click has already checked that the path is an existing directory, and resolved it
     if not is_ida_dir(path):
         console.print(f"[red]Invalid IDA installation directory: {path}[/red]")
         console.print("[yellow]The directory should contain the IDA binary[/yellow]")
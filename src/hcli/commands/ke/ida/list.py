@@ -3,14 +3,11 @@ from __future__ import annotations
 from pathlib import Path
 
 import rich_click as click
-from rich.console import Console
-from rich.table import Table
 
 from hcli.lib.config import config_store
+from hcli.lib.console import console
 from hcli.lib.ida import is_ida_dir
 
-console = Console()
-
 
 @click.command()
 def list_instances() -> None:
@@ -25,6 +22,9 @@ def list_instances() -> None:
         return
 
     # Create table
+    from rich.table import Table
+    from rich.text import Text
+
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("Name", style="cyan", width=20)
     table.add_column("Path", style="white")
@@ -32,14 +32,17 @@ def list_instances() -> None:
     table.add_column("Default", style="yellow", width=8)
 
     # Add rows
+    valid_count = 0
     for name, path_str in instances.items():
         path = Path(path_str)
 
-        # Check if the path still exists and is valid
-        if path.exists() and is_ida_dir(path):
+        # Check if the path still exists and is valid, once per instance
+        exists = path.exists()
+        if exists and is_ida_dir(path):
             status = "Valid"
             status_style = "green"
-        elif path.exists():
+            valid_count += 1
+        elif exists:
             status = "Invalid"
             status_style = "red"
         else:
@@ -49,12 +52,11 @@ def list_instances() -> None:
         # Check if this is the default
         is_default = "✓" if name == default_instance else ""
 
-        table.add_row(name, str(path), f"[{status_style}]{status}[/{status_style}]", is_default)
+        table.add_row(name, str(path), Text(status, style=status_style), is_default)
 
     console.print(table)
 
     # Show summary
-    valid_count = sum(1 for path_str in instances.values() if Path(path_str).exists() and is_ida_dir(Path(path_str)))
     total_count = len(instances)
 
     console.print(f"\n[blue]Summary:[/blue] {valid_count}/{total_count} instances are valid")
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
 import rich_click as click
-from rich.console import Console
 
 from hcli.lib.config import config_store
-
-console = Console()
+from hcli.lib.console import console
 
 
 @click.command()
@@ -33,13 +31,12 @@ def remove(all: bool, name: str | None) -> None:
         console.print("[yellow]No IDA instances registered.[/yellow]")
         return
 
-    if all:
-        # Remove all instances
-        _remove_all_instances(instances)
-    else:
-        # Remove single instance (name is guaranteed to be not None due to validation above)
-        assert name is not None
+    if name:
+        # Remove single instance
         _remove_single_instance(name, instances)
+    else:
+        # Remove all instances (--all is guaranteed by the validation above)
+        _remove_all_instances(instances)
 
 
 def _remove_all_instances(instances: dict[str, str]) -> None:
@@ -66,7 +63,7 @@ def _remove_single_instance(name: str, instances: dict[str, str]) -> None:
         # Show available instances
         if instances:
             console.print("[yellow]Available instances:[/yellow]")
-            for instance_name in instances.keys():
+            for instance_name in sorted(instances):
                 console.print(f"  - {instance_name}")
         else:
             console.print("[yellow]No IDA instances registered. Use 'hcli ke ida add' to add instances.[/yellow]")
@@ -83,9 +80,8 @@ def _remove_single_instance(name: str, instances: dict[str, str]) -> None:
     # Handle default instance removal
     if is_default:
         if instances:  # If there are remaining instances
-            # Select the last alphabetical instance as the new default
-            sorted_instance_names = sorted(instances.keys())
-            new_default = sorted_instance_names[-1]
+            # Select the last alphabetical remaining instance as the new default
+            new_default = max(instances)
             config_store.set_string("ke.ida.default", new_default)
             console.print(f"[green]Set '{new_default}' as new default IDA instance[/green]")
         else:
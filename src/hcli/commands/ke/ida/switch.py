@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import questionary
 import rich_click as click
-from rich.console import Console
 
 from hcli.lib.config import config_store
-
-console = Console()
+from hcli.lib.console import console
 
 
 @click.command()
@@ -38,6 +35,8 @@ def switch(name: str | None) -> None:
         return
 
     # Interactive selection
+    import questionary
+
     current_default = config_store.get_string("ke.ida.default", "")
 
     # Create choices with current default marked
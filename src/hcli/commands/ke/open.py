@@ -1,37 +1,36 @@
 from __future__ import annotations
 
+import os
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
 import rich_click as click
-from rich.console import Console
 
+from hcli.env import ENV
 from hcli.lib.commands import async_command
 from hcli.lib.config import config_store
+from hcli.lib.console import console
 from hcli.lib.ida import IdaProduct, get_default_ida_install_directory, get_ida_binary_path
 
-console = Console()
-
 
 @click.command(name="open", hidden=True)
 @click.argument("url", required=True)
 @async_command
 async def open_url(url: str | None) -> None:
     """HCLI protocol handler for ida://"""
-
     if not url:
         console.print("[red]No URL provided[/red]")
         raise click.Abort()
 
-    # Parse the URL
-    parsed_url = urlparse(url)
-
-    if parsed_url.scheme != "ida":
-        console.print(f"[red]Unsupported URL scheme: {parsed_url.scheme}[/red]")
+    # Check the scheme before doing the full parse
+    if not url.startswith("ida://"):
+        console.print(f"[red]Unsupported URL scheme: {url.partition(':')[0]}[/red]")
         raise click.Abort()
 
+    parsed_url = urlsplit(url)
+
     # Extract source name (hostname) and file path
     source_name = parsed_url.netloc
     file_path = parsed_url.path.lstrip("/")  # Remove leading slash
@@ -57,10 +56,9 @@ async def open_url(url: str | None) -> None:
         raise click.Abort()
 
     # Resolve full path
-    source_path = Path(sources[source_name])
-    full_path = source_path / file_path
+    full_path = os.path.join(sources[source_name], file_path)
 
-    if not full_path.exists():
+    if not os.path.exists(full_path):
         console.print(f"[red]File not found: {full_path}[/red]")
         raise click.Abort()
 
@@ -91,14 +89,13 @@ async def open_url(url: str | None) -> None:
             console.print(f"[yellow]URL resolution successful: {url} -> {full_path}[/yellow]")
             raise click.Abort()
 
-    # Log the URL to a temp file
-    log_file = "/tmp/hcli_urls.log"
-    timestamp = datetime.now().isoformat()
-
-    with open(str(log_file), "a", encoding="utf-8") as f:
-        f.write(f"{timestamp}: {url} -> {full_path} : {ida_bin}\n")
+    # Optionally log the URL, for debugging protocol handler registration
+    if ENV.HCLI_URL_LOG:
+        timestamp = datetime.now().isoformat()
+        with open(ENV.HCLI_URL_LOG, "a", encoding="utf-8") as f:
+            f.write(f"{timestamp}: {url} -> {full_path} : {ida_bin}\n")
 
     console.print(f"[green]Opening {full_path} with IDA Pro[/green]")
 
     # Launch IDA with the resolved file path
-    subprocess.Popen([ida_bin, str(full_path)])
+    subprocess.Popen([ida_bin, full_path])
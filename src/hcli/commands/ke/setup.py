@@ -88,9 +88,9 @@ async def _check_and_setup_ida_instances() -> None:
         console.print(f"[green]✓ Found {len(valid_installations)} IDA installation(s)[/green]")
 
         # Auto-register the discovered installations
+        named_installations = [(generate_instance_name(inst), inst) for inst in valid_installations]
         added_count = 0
-        for installation in valid_installations:
-            instance_name = generate_instance_name(installation)
+        for instance_name, installation in named_installations:
             if add_instance_to_config(instance_name, installation):
                 added_count += 1
 
@@ -98,8 +98,7 @@ async def _check_and_setup_ida_instances() -> None:
             console.print(f"[green]✓ Automatically registered {added_count} IDA instance(s)[/green]")
 
             # Set the last one alphabetically as default if no default exists
-            sorted_installations = sorted(valid_installations, key=lambda p: generate_instance_name(p))
-            last_instance = generate_instance_name(sorted_installations[-1])
+            last_instance = max(instance_name for instance_name, _ in named_installations)
             config_store.set_string("ke.ida.default", last_instance)
             console.print(f"[green]✓ Set '{last_instance}' as default IDA instance[/green]")
         else:
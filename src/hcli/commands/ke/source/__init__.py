@@ -2,17 +2,17 @@ from __future__ import annotations
 
 import rich_click as click
 
+from hcli.commands._lazy import LazyGroup
 
-@click.group()
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "add": ("hcli.commands.ke.source.add", "add"),
+        "remove": ("hcli.commands.ke.source.remove", "remove"),
+        "list": ("hcli.commands.ke.source.list", "list_sources"),
+    },
+)
 def source() -> None:
     """Manage knowledge sources."""
     pass
-
-
-from .add import add  # noqa: E402
-from .list import list_sources  # noqa: E402
-from .remove import remove  # noqa: E402
-
-source.add_command(add)
-source.add_command(remove)
-source.add_command(list_sources, name="list")
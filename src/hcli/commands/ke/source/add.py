@@ -3,16 +3,14 @@ from __future__ import annotations
 from pathlib import Path
 
 import rich_click as click
-from rich.console import Console
 
 from hcli.lib.config import config_store
-
-console = Console()
+from hcli.lib.console import console
 
 
 @click.command()
 @click.argument("name", type=str)
-@click.argument("path", type=click.Path(exists=True, path_type=Path))
+@click.argument("path", type=click.Path(exists=True, resolve_path=True, path_type=Path))
 def add(name: str, path: Path) -> None:
     """Add a knowledge source.
 
@@ -20,12 +18,7 @@ def add(name: str, path: Path) -> None:
     NAME: Logical name for the source
     PATH: Filesystem path to the source
     """
-    path = path.expanduser().resolve()
-
-    if not path.exists():
-        console.print(f"[red]Path does not exist: {path}[/red]")
-        raise click.Abort()
-
+    # click has already checked that the path exists and resolved it
     sources: dict[str, str] = config_store.get_object("ke.sources", {}) or {}
 
     if name in sources:
@@ -33,9 +26,9 @@ def add(name: str, path: Path) -> None:
         raise click.Abort()
 
     # Store the absolute path as string
-    sources[name] = str(path.absolute())
+    sources[name] = str(path)
 
     # Save back to config
     config_store.set_object("ke.sources", sources)
 
-    console.print(f"[green]Added source '{name}' pointing to '{path.absolute()}'[/green]")
+    console.print(f"[green]Added source '{name}' pointing to '{path}'[/green]")
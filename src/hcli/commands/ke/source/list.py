@@ -1,12 +1,10 @@
 from __future__ import annotations
 
 import rich_click as click
-from rich.console import Console
 from rich.table import Table
 
 from hcli.lib.config import config_store
-
-console = Console()
+from hcli.lib.console import console
 
 
 @click.command()
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
 import rich_click as click
-from rich.console import Console
 
 from hcli.lib.config import config_store
-
-console = Console()
+from hcli.lib.console import console
 
 
 @click.command()
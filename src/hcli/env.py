@@ -32,6 +32,9 @@ class ENV:
 
     HCLI_DISABLE_UPDATES: bool = os.getenv("HCLI_DISABLE_UPDATES", "").lower() in ("true", "yes", "on", "1")
 
+    # path to a file that `hcli ke open` appends handled ida:// URLs to
+    HCLI_URL_LOG: str | None = os.getenv("HCLI_URL_LOG")
+
     IDAUSR: str | None = os.getenv("IDAUSR")
     IDADIR: str | None = os.getenv("IDADIR")
 
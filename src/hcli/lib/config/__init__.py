@@ -21,13 +21,11 @@ class ConfigStore:
 
     def _load_config(self) -> None:
         """Load configuration from disk."""
-        if self._config_file.exists():
-            try:
-                with open(self._config_file, "r") as f:
-                    self._data = json.load(f)
-            except (json.JSONDecodeError, OSError):
-                self._data = {}
-        else:
+        try:
+            with open(self._config_file, "r") as f:
+                self._data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            # includes FileNotFoundError when there's no config yet
             self._data = {}
 
     def _save_config(self):
@@ -40,8 +38,8 @@ class ConfigStore:
         """Migrate configuration if version changed."""
         current_version = self.get_string("version", "0.0.0")
         if current_version != ENV.HCLI_VERSION:
+            # set_string() persists the change, no need for a second write
             self.set_string("version", ENV.HCLI_VERSION)
-            self._save_config()
 
     def has(self, key: str) -> bool:
         """Check if key exists in configuration."""
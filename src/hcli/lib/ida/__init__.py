@@ -7,6 +7,7 @@ import os
 import re
 import shutil
 import stat
+import struct
 import subprocess
 import tempfile
 from dataclasses import dataclass
@@ -23,6 +24,22 @@ from hcli.lib.util.io import NoSpaceError, check_free_space, get_os
 
 logger = logging.getLogger(__name__)
 
+# installer filename pattern: ida-{product}_{version}_{platform}
+INSTALLER_FILENAME_RE = re.compile(r"^ida-([^_]+)_(\d{2})(sp\d+)?_")
+
+# installer filename product part -> product name
+INSTALLER_PRODUCT_NAMES = {
+    "pro": "IDA Professional",
+    "home-pc": "IDA Home",
+    "home-arm": "IDA Home",
+    "home-mips": "IDA Home",
+    "home-ppc": "IDA Home",
+    "home-riscv": "IDA Home",
+    "free-pc": "IDA Free",
+    "essential": "IDA Essential",
+    "classroom-free": "IDA Classroom",
+}
+
 
 class DownloadResource(NamedTuple):
     """IDA download resource information."""
@@ -55,13 +72,10 @@ class IdaProduct:
             ValueError: If filename format is not recognized
         """
         basename = filename
-        for ext in [".app.zip", ".run", ".exe"]:
-            if basename.endswith(ext):
-                basename = basename[: -len(ext)]
-                break
+        for ext in (".app.zip", ".run", ".exe"):
+            basename = basename.removesuffix(ext)
 
-        # filename pattern: ida-{product}_{version}_{platform}
-        match = re.match(r"^ida-([^_]+)_(\d{2})(sp\d+)?_", basename)
+        match = INSTALLER_FILENAME_RE.match(basename)
         if not match:
             raise ValueError(f"Unrecognized installer filename format: {filename}")
 
@@ -70,19 +84,7 @@ class IdaProduct:
         version_minor = int(match.group(2)[1])  # like: 1
         suffix = match.group(3) if match.group(3) else None  # like: sp1
 
-        product_mapping = {
-            "pro": "IDA Professional",
-            "home-pc": "IDA Home",
-            "home-arm": "IDA Home",
-            "home-mips": "IDA Home",
-            "home-ppc": "IDA Home",
-            "home-riscv": "IDA Home",
-            "free-pc": "IDA Free",
-            "essential": "IDA Essential",
-            "classroom-free": "IDA Classroom",
-        }
-
-        product = product_mapping.get(product_part, f"IDA {product_part.title()}")
+        product = INSTALLER_PRODUCT_NAMES.get(product_part, f"IDA {product_part.title()}")
         return cls(product, version_major, version_minor, suffix)
 
     def __str__(self):
@@ -125,20 +127,10 @@ def get_ida_user_dir() -> Path:
     if ENV.IDAUSR is not None:
         return Path(ENV.IDAUSR)
 
-    os_ = get_os()
-    if os_ == "windows":
-        appdata = os.environ.get("APPDATA")
-        if not appdata:
-            raise ValueError("Failed to determine %APPDATA% location: environment variable not set")
-
-        return Path(appdata) / "Hex-Rays" / "IDA Pro"
-    elif os_ in ("linux", "mac"):
-        home = os.environ.get("HOME")
-        if not home:
-            raise ValueError("Failed to determine home directory: environment variable not set")
-        return Path(home) / ".idapro"
+    if get_os() == "windows":
+        return get_user_home_dir() / "Hex-Rays" / "IDA Pro"
     else:
-        raise ValueError(f"Unsupported operating system: {os_}")
+        return get_user_home_dir() / ".idapro"
 
 
 def get_user_home_dir() -> Path:
@@ -196,17 +188,17 @@ def get_default_ida_install_directory(ver: IdaProduct) -> Path:
 def get_ida_path(ida_dir: Path) -> Path:
     """Get the IDA application path from the installation directory."""
     if get_os() == "mac":
-        return Path(ida_dir) / "Contents" / "MacOS"
+        return ida_dir / "Contents" / "MacOS"
     else:
-        return Path(ida_dir)
+        return ida_dir
 
 
 def get_ida_binary_path(ida_dir: Path, suffix: str = "") -> Path:
     """Get the IDA binary path."""
     if get_os() == "windows":
-        return Path(get_ida_path(ida_dir)) / f"ida{suffix}.exe"
+        return get_ida_path(ida_dir) / f"ida{suffix}.exe"
     else:
-        return Path(get_ida_path(ida_dir)) / f"ida{suffix}"
+        return get_ida_path(ida_dir) / f"ida{suffix}"
 
 
 def get_idat_path(ida_dir: Path) -> Path:
@@ -214,63 +206,37 @@ def get_idat_path(ida_dir: Path) -> Path:
     return get_ida_binary_path(ida_dir, "t")
 
 
-def find_standard_windows_installations() -> list[Path]:
-    """Find standard IDA Pro installations on Windows."""
-    ret = []
-
-    base_directory = Path(os.environ.get("ProgramFiles", r"C:\Program Files"))
-
-    # Check the base directory for IDA installations
-    if base_directory.exists():
-        for entry in base_directory.iterdir():
-            if not entry.is_dir():
-                continue
+def _find_ida_dirs(base_directory: Path) -> list[Path]:
+    """Find IDA Pro installation directories directly within the given directory."""
+    if not base_directory.exists():
+        return []
 
-            if not entry.name.startswith("IDA Pro"):
-                continue
+    # DirEntry.is_dir() is answered from the directory listing, without a stat per entry
+    with os.scandir(base_directory) as it:
+        return [Path(entry.path) for entry in it if entry.name.startswith("IDA Pro") and entry.is_dir()]
 
-            ret.append(entry)
 
-    return ret
+def find_standard_windows_installations() -> list[Path]:
+    """Find standard IDA Pro installations on Windows."""
+    return _find_ida_dirs(Path(os.environ.get("ProgramFiles", r"C:\Program Files")))
 
 
 def find_standard_linux_installations() -> list[Path]:
     """Find standard IDA Pro installations on Linux."""
     # TODO: can also look in registered XDG applications, or maybe in /opt
-    ret = []
-    base_directory = get_user_home_dir() / ".local" / "share" / "applications"
-
-    if base_directory.exists():
-        for entry in base_directory.iterdir():
-            if not entry.is_dir():
-                continue
-
-            if not entry.name.startswith("IDA Pro"):
-                continue
-
-            ret.append(entry)
-
-    return ret
+    return _find_ida_dirs(get_user_home_dir() / ".local" / "share" / "applications")
 
 
 def find_standard_mac_installations() -> list[Path]:
     """Find standard IDA Pro installations on macOS."""
-    ret = []
-
-    base_directory = Path("/Applications")
-
-    # Check the base directory for IDA installations
-    if base_directory.exists():
-        for entry in base_directory.iterdir():
-            if not entry.is_dir():
-                continue
-
-            if not entry.name.startswith("IDA Pro"):
-                continue
+    return _find_ida_dirs(Path("/Applications"))
 
-            ret.append(entry)
 
-    return ret
+_STANDARD_INSTALLATION_FINDERS = {
+    "windows": find_standard_windows_installations,
+    "linux": find_standard_linux_installations,
+    "mac": find_standard_mac_installations,
+}
 
 
 def find_standard_installations() -> list[Path]:
@@ -283,22 +249,17 @@ def find_standard_installations() -> list[Path]:
         pass
 
     os_ = get_os()
-    if os_ == "windows":
-        ret.update(find_standard_windows_installations())
-    elif os_ == "linux":
-        ret.update(find_standard_linux_installations())
-    elif os_ == "mac":
-        ret.update(find_standard_mac_installations())
-    else:
+    find_installations = _STANDARD_INSTALLATION_FINDERS.get(os_)
+    if find_installations is None:
         raise ValueError(f"Unsupported operating system: {os_}")
+    ret.update(find_installations())
 
     return list(ret)
 
 
 def is_ida_dir(ida_dir: Path) -> bool:
     """Check if a directory contains a valid IDA installation."""
-    binary_path = Path(get_ida_binary_path(ida_dir))
-    return binary_path.exists()
+    return get_ida_binary_path(ida_dir).exists()
 
 
 def install_license(license_path: Path, target_path: Path) -> None:
@@ -322,9 +283,8 @@ def accept_eula(install_dir: Path) -> None:
     except Exception:
         raise RuntimeError("idalib not available")
 
-    ida_registry.reg_write_int("EULA 90", 1)
-    ida_registry.reg_write_int("EULA 91", 1)
-    ida_registry.reg_write_int("EULA 92", 1)
+    for key in ("EULA 90", "EULA 91", "EULA 92"):
+        ida_registry.reg_write_int(key, 1)
     logger.info("EULA accepted")
 
 
@@ -358,14 +318,10 @@ def install_ida(installer: Path, install_dir: Path):
 
     try:
         current_os = get_os()
-        if current_os == "mac":
-            _install_ida_mac(installer, install_dir)
-        elif current_os == "linux":
-            _install_ida_unix(installer, install_dir)
-        elif current_os == "windows":
-            _install_ida_windows(installer, install_dir)
-        else:
+        install = _INSTALLERS.get(current_os)
+        if install is None:
             raise ValueError(f"unsupported OS: {current_os}")
+        install(installer, install_dir)
     except Exception as e:
         logger.error(f"Installation failed: {e}")
         raise
@@ -375,15 +331,19 @@ def install_ida(installer: Path, install_dir: Path):
     if not len(contents):
         raise RuntimeError("installation failed: installation directory contents not created")
 
-    has_ida_hlp = False
-    for _, _, files in os.walk(install_dir):
-        if "ida.hlp" in files:
-            has_ida_hlp = True
-
-    if not has_ida_hlp:
+    if not _has_ida_hlp(install_dir):
         raise RuntimeError("installation failed: ida.hlp not created")
 
 
+def _has_ida_hlp(install_dir: Path) -> bool:
+    """Check that an installation contains ida.hlp."""
+    # expected next to the binaries; only search the whole tree if it isn't there
+    if (get_ida_path(install_dir) / "ida.hlp").exists():
+        return True
+
+    return any("ida.hlp" in files for _, _, files in os.walk(install_dir))
+
+
 def _install_ida_mac(installer: Path, prefix: Path) -> None:
     """Install IDA on macOS."""
     if not shutil.which("unzip"):
@@ -394,10 +354,9 @@ def _install_ida_mac(installer: Path, prefix: Path) -> None:
             logger.info(f"Unpacking installer to {temp_unpack_dir}...")
 
             # Unpack the installer
-            process = subprocess.run(["unzip", "-qq", str(installer), "-d", temp_unpack_dir], capture_output=True)
-
-            if process.returncode != 0:
-                raise RuntimeError("Failed to unpack installer")
+            _run_installer_command(
+                ["unzip", "-qq", str(installer), "-d", temp_unpack_dir], "Failed to unpack installer"
+            )
 
             entries = list(Path(temp_unpack_dir).iterdir())
             if len(entries) != 1:
@@ -422,19 +381,20 @@ def _install_ida_mac(installer: Path, prefix: Path) -> None:
             temp_install_path = Path(temp_install_dir)
             args = _get_installer_args(temp_install_path)
 
-            process = subprocess.run([str(installer_path)] + args, capture_output=True)
-
-            if process.returncode != 0:
-                raise RuntimeError("Installer execution failed")
+            _run_installer_command([str(installer_path)] + args, "Installer execution failed")
 
             # Find installed folder and copy to prefix
-            installed_folders = list(temp_install_path.iterdir())
+            # Path.iterdir() lists the whole directory before Python 3.13; scandir stops at the first entry
+            with os.scandir(temp_install_path) as it:
+                entry = next(it, None)
 
-            if not installed_folders:
+            if entry is None:
                 raise RuntimeError("No installation found after running installer")
 
-            install_folder = installed_folders[0]
-            _copy_dir(install_folder, prefix)
+            install_folder = Path(entry.path)
+
+            # the temporary installation is deleted right after, so it can share files with the prefix
+            _copy_dir(install_folder, prefix, link=True)
 
 
 def _install_ida_unix(installer: Path, prefix: Path) -> None:
@@ -447,29 +407,39 @@ def _install_ida_unix(installer: Path, prefix: Path) -> None:
     if not installer_path.is_absolute() and installer_path.parent == Path("."):
         installer_path = Path(f"./{installer_path}")
 
-    if not os.access(installer_path, os.X_OK):
+    current_mode = os.stat(installer_path).st_mode
+    if not current_mode & stat.S_IXUSR:
         logger.info(f"Setting executable permission on {installer_path}")
-        current_mode = os.stat(installer_path).st_mode
         os.chmod(installer_path, current_mode | stat.S_IXUSR)
 
-    home_dir = get_user_home_dir()
-    share_dir = Path(home_dir) / ".local" / "share" / "applications"
+    share_dir = get_user_home_dir() / ".local" / "share" / "applications"
     share_dir.mkdir(parents=True, exist_ok=True)
 
-    process = subprocess.run([str(installer_path)] + args, capture_output=True)
-
-    if process.returncode != 0:
-        raise RuntimeError("Installer execution failed")
+    _run_installer_command([str(installer_path)] + args, "Installer execution failed")
 
 
 def _install_ida_windows(installer: Path, prefix: Path) -> None:
     """Install IDA on Windows."""
     args = _get_installer_args(prefix)
 
-    process = subprocess.run(["cmd", "/c", str(installer)] + args, capture_output=True)
+    _run_installer_command(["cmd", "/c", str(installer)] + args, "Installer execution failed")
+
+
+_INSTALLERS = {
+    "mac": _install_ida_mac,
+    "linux": _install_ida_unix,
+    "windows": _install_ida_windows,
+}
+
+
+def _run_installer_command(cmd: list[str], error: str) -> None:
+    """Run an installer step, raising RuntimeError with its stderr if it fails."""
+    # stdout isn't used, and with --debugtrace it can be large, so don't buffer it
+    process = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
     if process.returncode != 0:
-        raise RuntimeError("Installer execution failed")
+        stderr = process.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"{error}: {stderr}" if stderr else error)
 
 
 def _get_installer_args(prefix: Path) -> list[str]:
@@ -485,29 +455,38 @@ def _get_installer_args(prefix: Path) -> list[str]:
     return args
 
 
-def _copy_dir(src_path: Path, dest_path: Path) -> None:
-    """Copy directory recursively."""
+def _copy_dir(src_path: Path, dest_path: Path, link: bool = False) -> None:
+    """Copy directory recursively.
+
+    With `link`, files are hardlinked rather than copied when both trees are on the same filesystem.
+    Only use this when the source is discarded afterwards, since the two trees then share file contents.
+    """
     if not src_path.exists():
         return
 
     dest_path.mkdir(parents=True, exist_ok=True)
+    link = link and os.stat(src_path).st_dev == os.stat(dest_path).st_dev
 
-    for item in src_path.rglob("*"):
-        relative_path = item.relative_to(src_path)
-        dest_item = dest_path / relative_path
-
-        if item.is_dir():
-            dest_item.mkdir(parents=True, exist_ok=True)
-        elif item.is_file():
-            dest_item.parent.mkdir(parents=True, exist_ok=True)
+    def copy_file(src: str, dst: str) -> None:
+        # symlinks never get here (see symlinks=True below), but don't let a link follow one either
+        if link:
             try:
-                shutil.copy2(item, dest_item)
+                os.link(src, dst, follow_symlinks=False)
+                return
             except OSError as e:
-                if e.errno == errno.ENOSPC:
-                    if dest_item.exists():
-                        dest_item.unlink()
-                    raise NoSpaceError(dest_path) from e
-                raise
+                logger.debug("failed to hardlink %s, copying instead: %s", src, e)
+
+        try:
+            shutil.copy2(src, dst)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                Path(dst).unlink(missing_ok=True)
+                # not an OSError, so copytree doesn't collect it and keep going
+                raise NoSpaceError(dest_path) from e
+            raise
+
+    # keep symlinks as links: app bundles rely on them (like Versions/Current), and some may dangle
+    shutil.copytree(src_path, dest_path, symlinks=True, copy_function=copy_file, dirs_exist_ok=True)
 
 
 class PathsConfig(BaseModel):
@@ -552,27 +531,24 @@ class IDAConfigJson(BaseModel):
 
 
 def get_ida_config_path() -> Path:
-    idausr = get_ida_user_dir()
-
-    return Path(idausr) / "ida-config.json"
+    return get_ida_user_dir() / "ida-config.json"
 
 
 def get_ida_config() -> IDAConfigJson:
     ida_config_path = get_ida_config_path()
-    if not ida_config_path.exists():
+    try:
+        content = ida_config_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
         logger.debug("using default ida-config.json contents")
         return IDAConfigJson()
 
-    return IDAConfigJson.model_validate_json(ida_config_path.read_text(encoding="utf-8"))
+    return IDAConfigJson.model_validate_json(content)
 
 
 def set_ida_config(config: IDAConfigJson):
     ida_config_path = get_ida_config_path()
-    if not ida_config_path.exists():
-        logger.debug("creating $IDAUSR directory")
-        ida_config_path.parent.mkdir(parents=True, exist_ok=True)
-
-    _ = ida_config_path.write_text(config.model_dump_json())
+    ida_config_path.parent.mkdir(parents=True, exist_ok=True)
+    _ = ida_config_path.write_bytes(config.model_dump_json().encode("utf-8"))
 
 
 class MissingCurrentInstallationDirectory(ValueError):
@@ -709,39 +685,60 @@ def run_py_in_current_idapython(src: str) -> str:
         if result.stderr:
             logger.debug(f"idat stderr: {result.stderr}")
 
-        if not log_path.exists():
+        try:
+            log = log_path.open("r", encoding="utf-8", errors="replace")
+        except FileNotFoundError:
             raise RuntimeError(f"failed to invoke idat: log file was not created: {log_path}")
 
-        for line in log_path.read_text().splitlines():
-            if not line.startswith("__hcli__:"):
-                continue
+        # stream the log, which can be large, and stop at the first result line
+        with log:
+            for line in log:
+                if not line.startswith("__hcli__:"):
+                    continue
 
-            return json.loads(line[len("__hcli__:") :])
+                return json.loads(line[len("__hcli__:") :])
 
         raise RuntimeError("failed to invoke idat: could not find expected lines in log output")
 
 
+def _read_current_ida_cache(cache_path: Path) -> dict[str, str]:
+    """Read a current-ida cache document, or an empty one if it doesn't exist yet."""
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def _write_current_ida_cache(cache_path: Path, doc: dict[str, str]) -> None:
+    """Replace a current-ida cache document atomically, so readers never see a partial file."""
+    # a unique temp file per writer, so concurrent hcli processes don't clobber each other's
+    fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(doc, separators=(",", ":")))
+        os.replace(tmp_name, cache_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def get_current_ida_platform_cache_path() -> Path:
     return get_cache_directory("current-ida") / "platform.json"
 
 
 def set_current_ida_platform_cache(ida_path: Path, platform: str) -> None:
     cache_path = get_current_ida_platform_cache_path()
-    if cache_path.exists():
-        doc = json.loads(cache_path.read_text(encoding="utf-8"))
-    else:
-        doc = {}
+    doc = _read_current_ida_cache(cache_path)
     doc[str(ida_path.absolute())] = platform
-    cache_path.write_text(json.dumps(doc), encoding="utf-8")
+    _write_current_ida_cache(cache_path, doc)
 
 
 def get_current_ida_platform_cache(ida_path: Path) -> str:
-    cache_path = get_current_ida_platform_cache_path()
-    if not cache_path.exists():
+    doc = _read_current_ida_cache(get_current_ida_platform_cache_path())
+    platform = doc.get(str(ida_path.absolute()))
+    if platform is None:
         raise KeyError(f"No platform cache found for {ida_path}")
-
-    doc = json.loads(cache_path.read_text(encoding="utf-8"))
-    return doc[str(ida_path.absolute())]
+    return platform
 
 
 FIND_PLATFORM_PY = """
@@ -773,6 +770,35 @@ sys.exit()
 """
 
 
+# Mach-O 64-bit header magic, and cputype -> platform, from <mach-o/loader.h>, <mach/machine.h>
+MACHO_MAGIC_64 = 0xFEEDFACF
+MACHO_CPU_TYPE_PLATFORMS = {
+    0x01000007: "macos-x86_64",  # CPU_TYPE_X86_64
+    0x0100000C: "macos-aarch64",  # CPU_TYPE_ARM64
+}
+
+
+def get_macho_platform(binary_path: Path) -> str | None:
+    """Get the platform of a single-architecture Mach-O binary, like 'macos-aarch64'.
+
+    Returns None when it can't be determined from the header, such as for universal binaries.
+    """
+    try:
+        with binary_path.open("rb") as f:
+            header = f.read(8)
+    except OSError:
+        return None
+
+    if len(header) != 8:
+        return None
+
+    magic, cpu_type = struct.unpack("<II", header)
+    if magic != MACHO_MAGIC_64:
+        return None
+
+    return MACHO_CPU_TYPE_PLATFORMS.get(cpu_type)
+
+
 def find_current_ida_platform() -> str:
     """find the platform associated with the current IDA installation"""
     # duplicate here, because we prefer access through ENV
@@ -794,10 +820,16 @@ def find_current_ida_platform() -> str:
             return get_current_ida_platform_cache(ida_dir)
         except KeyError:
             pass
-        try:
-            platform = run_py_in_current_idapython(FIND_PLATFORM_PY)
-        except RuntimeError as e:
-            raise RuntimeError("failed to determine current IDA platform") from e
+
+        # the installed binary's header tells the arch without starting IDA,
+        # which also handles x86_64 IDA running under Rosetta on Apple silicon.
+        app_dir = ida_dir.parent.parent if ida_dir.name == "MacOS" else ida_dir
+        platform = get_macho_platform(get_ida_binary_path(app_dir))
+        if platform is None:
+            try:
+                platform = run_py_in_current_idapython(FIND_PLATFORM_PY)
+            except RuntimeError as e:
+                raise RuntimeError("failed to determine current IDA platform") from e
         set_current_ida_platform_cache(ida_dir, platform)
         return platform
     else:
@@ -810,21 +842,17 @@ def get_current_ida_version_cache_path() -> Path:
 
 def set_current_ida_version_cache(ida_path: Path, version: str) -> None:
     cache_path = get_current_ida_version_cache_path()
-    if cache_path.exists():
-        doc = json.loads(cache_path.read_text(encoding="utf-8"))
-    else:
-        doc = {}
+    doc = _read_current_ida_cache(cache_path)
     doc[str(ida_path.absolute())] = version
-    cache_path.write_text(json.dumps(doc), encoding="utf-8")
+    _write_current_ida_cache(cache_path, doc)
 
 
 def get_current_ida_version_cache(ida_path: Path) -> str:
-    cache_path = get_current_ida_version_cache_path()
-    if not cache_path.exists():
+    doc = _read_current_ida_cache(get_current_ida_version_cache_path())
+    version = doc.get(str(ida_path.absolute()))
+    if version is None:
         raise KeyError(f"No version cache found for {ida_path}")
-
-    doc = json.loads(cache_path.read_text(encoding="utf-8"))
-    return doc[str(ida_path.absolute())]
+    return version
 
 
 FIND_VERSION_PY = """
@@ -869,16 +897,13 @@ def generate_instance_name(path: Path) -> str:
     name = path.name
 
     # Remove .app extension for macOS
-    if name.endswith(".app"):
-        name = name[:-4]
+    name = name.removesuffix(".app")
 
     # Convert to lowercase and replace spaces with dashes
     name = name.lower().replace(" ", "-")
 
     # Shorten common patterns
     name = name.replace("ida-professional", "ida-pro")
-    name = name.replace("ida-home", "ida-home")
-    name = name.replace("ida-free", "ida-free")
 
     return name
 
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import os
-import platform
+import plistlib
 import shutil
+import stat
 import subprocess
 import tempfile
 from pathlib import Path
 
 from hcli.lib.console import console
-from hcli.lib.util.io import get_hcli_executable_path
+from hcli.lib.util.io import get_hcli_executable_path, get_os
 
 
 def setup_macos_protocol_handler() -> None:
@@ -38,47 +39,24 @@ end run
             # Compile AppleScript to application
             subprocess.run(["osacompile", "-o", str(app_path), str(script_path)], check=True)
 
-            # Create Info.plist for the app to register URL scheme
+            # Register the URL scheme in the app's Info.plist
             info_plist_path = app_path / "Contents" / "Info.plist"
-
-            # Read existing plist
-            result = subprocess.run(
-                ["plutil", "-convert", "xml1", "-o", "-", str(info_plist_path)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            plist_content = result.stdout
-
-            # Add URL scheme handler to plist
-            url_scheme_xml = """
-        <key>CFBundleURLTypes</key>
-        <array>
-            <dict>
-                <key>CFBundleURLName</key>
-                <string>IDA URL Handler</string>
-                <key>CFBundleURLSchemes</key>
-                <array>
-                    <string>ida</string>
-                </array>
-            </dict>
-        </array>"""
-
-            # Insert before closing </dict></plist>
-            if "<key>CFBundleURLTypes</key>" not in plist_content:
-                plist_content = plist_content.replace("</dict>\n</plist>", f"{url_scheme_xml}\n</dict>\n</plist>")
-
-                # Write back the modified plist
-                with tempfile.NamedTemporaryFile(mode="w", suffix=".plist", delete=False) as temp_plist:
-                    temp_plist.write(plist_content)
-                    temp_plist_path = temp_plist.name
-
-                # Convert back to binary and replace original
-                subprocess.run(["plutil", "-convert", "binary1", temp_plist_path], check=True)
-
-                shutil.copy2(temp_plist_path, info_plist_path)
-                os.unlink(temp_plist_path)
+            with info_plist_path.open("rb") as f:
+                info_plist = plistlib.load(f)
+
+            if "CFBundleURLTypes" not in info_plist:
+                info_plist["CFBundleURLTypes"] = [
+                    {
+                        "CFBundleURLName": "IDA URL Handler",
+                        "CFBundleURLSchemes": ["ida"],
+                    }
+                ]
+
+                # Write back as binary, replacing the original atomically
+                temp_plist_path = info_plist_path.with_suffix(".plist.tmp")
+                with temp_plist_path.open("wb") as f:
+                    plistlib.dump(info_plist, f, fmt=plistlib.FMT_BINARY)
+                os.replace(temp_plist_path, info_plist_path)
 
             # Register the app with Launch Services
             subprocess.run(
@@ -117,12 +95,7 @@ def setup_windows_protocol_handler() -> None:
         with winreg.CreateKey(HKEY_CURRENT_USER, r"SOFTWARE\Classes\ida\DefaultIcon") as key:  # type: ignore[attr-defined]
             winreg.SetValueEx(key, "", 0, REG_SZ, f"{hcli_path},1")  # type: ignore[attr-defined]
 
-        with winreg.CreateKey(HKEY_CURRENT_USER, r"SOFTWARE\Classes\ida\shell") as key:  # type: ignore[attr-defined]
-            pass
-
-        with winreg.CreateKey(HKEY_CURRENT_USER, r"SOFTWARE\Classes\ida\shell\open") as key:  # type: ignore[attr-defined]
-            pass
-
+        # CreateKey also creates the intermediate shell and shell\open keys
         with winreg.CreateKey(HKEY_CURRENT_USER, r"SOFTWARE\Classes\ida\shell\open\command") as key:  # type: ignore[attr-defined]
             winreg.SetValueEx(key, "", 0, REG_SZ, command)  # type: ignore[attr-defined]
 
@@ -136,6 +109,31 @@ def setup_windows_protocol_handler() -> None:
         raise
 
 
+def _update_desktop_database(applications_dir: Path) -> None:
+    """Update the desktop database. May fail on some systems but not critical."""
+    try:
+        subprocess.run(["update-desktop-database", str(applications_dir)], check=False)
+    except FileNotFoundError:
+        # not installed on some minimal systems
+        console.print("[yellow]Skipping update-desktop-database: not installed[/yellow]")
+
+
+def _write_if_changed(path: Path, content: str, mode: int) -> bool:
+    """Write a file unless it already has this content, and ensure its mode. Returns whether it was written."""
+    try:
+        changed = path.read_text() != content
+    except FileNotFoundError:
+        changed = True
+
+    if changed:
+        path.write_text(content)
+
+    if changed or stat.S_IMODE(path.stat().st_mode) != mode:
+        path.chmod(mode)
+
+    return changed
+
+
 def setup_linux_protocol_handler() -> None:
     """Set up protocol handler for Linux using desktop entry and xdg-mime."""
     try:
@@ -155,18 +153,14 @@ MimeType=x-scheme-handler/ida;
         applications_dir.mkdir(parents=True, exist_ok=True)
 
         desktop_file_path = applications_dir / "hcli-url-handler.desktop"
-        desktop_file_path.write_text(desktop_entry_content)
-
-        # Make executable
-        desktop_file_path.chmod(0o755)
+        desktop_file_changed = _write_if_changed(desktop_file_path, desktop_entry_content, mode=0o755)
 
-        # Register with xdg-mime
+        # Register with xdg-mime, always, since another application may have claimed the scheme
         subprocess.run(["xdg-mime", "default", "hcli-url-handler.desktop", "x-scheme-handler/ida"], check=True)
 
-        # Update desktop database
-        subprocess.run(
-            ["update-desktop-database", str(applications_dir)], check=False
-        )  # May fail on some systems but not critical
+        # Update desktop database, which indexes the desktop entries, so only when ours changed
+        if desktop_file_changed:
+            _update_desktop_database(applications_dir)
 
         console.print(f"[green]✓[/green] Linux protocol handler installed at {desktop_file_path}")
 
@@ -254,10 +248,7 @@ def unregister_linux_protocol_handler() -> None:
         )
 
         # Update desktop database
-        subprocess.run(
-            ["update-desktop-database", str(applications_dir)],
-            check=False,  # May fail on some systems but not critical
-        )
+        _update_desktop_database(applications_dir)
 
         console.print(f"[green]✓[/green] Linux protocol handler removed from {desktop_file_path}")
 
@@ -266,31 +257,36 @@ def unregister_linux_protocol_handler() -> None:
         raise
 
 
+_PROTOCOL_HANDLER_SETUPS = {
+    "mac": setup_macos_protocol_handler,
+    "windows": setup_windows_protocol_handler,
+    "linux": setup_linux_protocol_handler,
+}
+
+_PROTOCOL_HANDLER_UNREGISTERS = {
+    "mac": unregister_macos_protocol_handler,
+    "windows": unregister_windows_protocol_handler,
+    "linux": unregister_linux_protocol_handler,
+}
+
+
 def register_protocol_handler() -> None:
     """Set up protocol handler for the current platform."""
-    current_platform = platform.system().lower()
-
-    if current_platform == "darwin":
-        setup_macos_protocol_handler()
-    elif current_platform == "windows":
-        setup_windows_protocol_handler()
-    elif current_platform == "linux":
-        setup_linux_protocol_handler()
-    else:
+    current_platform = get_os()
+    setup = _PROTOCOL_HANDLER_SETUPS.get(current_platform)
+    if setup is None:
         console.print(f"[red]Unsupported platform: {current_platform}[/red]")
         raise RuntimeError(f"Platform {current_platform} is not supported")
 
+    setup()
+
 
 def unregister_protocol_handler() -> None:
     """Remove protocol handler for the current platform."""
-    current_platform = platform.system().lower()
-
-    if current_platform == "darwin":
-        unregister_macos_protocol_handler()
-    elif current_platform == "windows":
-        unregister_windows_protocol_handler()
-    elif current_platform == "linux":
-        unregister_linux_protocol_handler()
-    else:
+    current_platform = get_os()
+    unregister = _PROTOCOL_HANDLER_UNREGISTERS.get(current_platform)
+    if unregister is None:
         console.print(f"[red]Unsupported platform: {current_platform}[/red]")
         raise RuntimeError(f"Platform {current_platform} is not supported")
+
+    unregister()
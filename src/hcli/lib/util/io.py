@@ -2,6 +2,7 @@
 
 import asyncio
 import asyncio.subprocess
+import functools
 import os
 import platform
 import shutil
@@ -219,8 +220,12 @@ async def read_text_file(path: str) -> str:
         return ""
 
 
+@functools.cache
 def get_os() -> str:
-    """Get the normalized OS name."""
+    """Get the normalized OS name.
+
+    The result is cached, since the OS can't change while the process is running.
+    """
     system = platform.system()
     if system == "Windows":
         return "windows"
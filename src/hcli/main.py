@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
 import rich_click as click
 from rich.logging import RichHandler
 
-from hcli.commands import register_commands
+from hcli.commands import LazyGroup, register_commands
 from hcli.env import ENV
 from hcli.lib.console import console, stderr_console
 from hcli.lib.extensions import get_extensions
-from hcli.lib.update.version import BackgroundUpdateChecker, is_binary
+
+if TYPE_CHECKING:
+    from hcli.lib.update.version import BackgroundUpdateChecker
 
 # Configure rich-click styling
 click.rich_click.USE_RICH_MARKUP = True
@@ -32,8 +35,8 @@ def get_help_text():
     return base_help
 
 
-class MainGroup(click.RichGroup):
-    """Custom Rich Click Group with global exception handling."""
+class MainGroup(LazyGroup):
+    """Custom lazy Rich Click Group with global exception handling."""
 
     def main(self, *args, **kwargs):
         """Override main to add global exception handling."""
@@ -102,6 +105,9 @@ def handle_command_completion(_ctx, _result, **_kwargs):
 @click.pass_context
 def cli(_ctx, quiet, auth, auth_credentials, disable_updates: bool):
     """Main CLI entry point with background update checking."""
+    # imported here so that eager options like --version and --help don't pay for the HTTP stack
+    from hcli.lib.update.version import BackgroundUpdateChecker, is_binary
+
     if is_binary() and not (disable_updates or ENV.HCLI_DISABLE_UPDATES):
         global update_checker
 
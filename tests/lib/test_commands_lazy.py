@@ -0,0 +1,50 @@
+"""Tests for lazily registered CLI subcommands."""
+
+import sys
+
+import pytest
+import rich_click as click
+from click.testing import CliRunner
+
+from hcli.commands import LazyGroup
+
+
+@pytest.mark.unit
+def test_lazy_group_defers_import():
+    """Test that a lazy subcommand module is only imported when the command is resolved."""
+    sys.modules.pop("hcli.commands.whoami", None)
+
+    @click.group(cls=LazyGroup, lazy_subcommands={"whoami": ("hcli.commands.whoami", "whoami")})
+    def root() -> None:
+        pass
+
+    ctx = click.Context(root)
+    assert root.list_commands(ctx) == ["whoami"]
+    assert "hcli.commands.whoami" not in sys.modules
+
+    command = root.get_command(ctx, "whoami")
+    assert command is not None
+    assert command.name == "whoami"
+    assert "hcli.commands.whoami" in sys.modules
+    assert root.commands["whoami"] is command
+
+
+@pytest.mark.unit
+def test_lazy_group_lists_eager_and_lazy_commands():
+    """Test that eagerly added commands and lazy subcommands are listed together."""
+
+    @click.group(cls=LazyGroup, lazy_subcommands={"whoami": ("hcli.commands.whoami", "whoami")})
+    def root() -> None:
+        pass
+
+    @root.command()
+    def hello() -> None:
+        click.echo("hello")
+
+    ctx = click.Context(root)
+    assert root.list_commands(ctx) == ["hello", "whoami"]
+    assert root.get_command(ctx, "missing") is None
+
+    result = CliRunner().invoke(root, ["hello"])
+    assert result.exit_code == 0
+    assert result.output == "hello\n"
@@ -5,12 +5,18 @@ from pathlib import Path
 import pytest
 
 from hcli.lib.ida import (
+    IdaProduct,
+    _read_current_ida_cache,
+    _write_current_ida_cache,
     find_current_ida_install_directory,
     find_current_ida_platform,
     find_current_ida_version,
     find_current_idat_executable,
+    generate_instance_name,
     get_ida_config,
     get_ida_config_path,
+    get_macho_platform,
+    set_ida_config,
 )
 
 
@@ -27,6 +33,20 @@ def test_get_ida_config():
     assert hasattr(result.paths, "installation_directory")
 
 
+@pytest.mark.unit
+def test_get_ida_config_returns_independent_copies(tmp_path, monkeypatch):
+    monkeypatch.setenv("HCLI_IDAUSR", str(tmp_path))
+
+    config = get_ida_config()
+    config.paths.installation_directory = tmp_path
+    set_ida_config(config)
+
+    first = get_ida_config()
+    assert first.paths.installation_directory == tmp_path
+    first.paths.installation_directory = None
+    assert get_ida_config().paths.installation_directory == tmp_path
+
+
 def test_find_current_ida_install_directory():
     result = find_current_ida_install_directory()
     assert isinstance(result, Path)
@@ -34,6 +54,39 @@ def test_find_current_ida_install_directory():
     assert result.is_dir()
 
 
+@pytest.mark.unit
+def test_ida_product_from_installer_filename():
+    assert IdaProduct.from_installer_filename("ida-pro_92_x64linux.run") == IdaProduct("IDA Professional", 9, 2)
+    assert IdaProduct.from_installer_filename("ida-home-pc_91sp1_armmac.app.zip") == IdaProduct("IDA Home", 9, 1, "sp1")
+    assert str(IdaProduct.from_installer_filename("ida-essential_92_x64win.exe")) == "IDA Essential 9.2"
+
+    with pytest.raises(ValueError):
+        IdaProduct.from_installer_filename("idapro_92_x64linux.run")
+
+
+@pytest.mark.unit
+def test_generate_instance_name():
+    assert generate_instance_name(Path("/Applications/IDA Professional 9.2.app")) == "ida-pro-9.2"
+    assert generate_instance_name(Path("/opt/IDA Home 9.1")) == "ida-home-9.1"
+
+
+@pytest.mark.unit
+def test_get_macho_platform(tmp_path):
+    arm64 = tmp_path / "arm64"
+    arm64.write_bytes(bytes.fromhex("cffaedfe0c000001") + b"\x00" * 24)
+    assert get_macho_platform(arm64) == "macos-aarch64"
+
+    x86_64 = tmp_path / "x86_64"
+    x86_64.write_bytes(bytes.fromhex("cffaedfe07000001") + b"\x00" * 24)
+    assert get_macho_platform(x86_64) == "macos-x86_64"
+
+    universal = tmp_path / "universal"
+    universal.write_bytes(bytes.fromhex("cafebabe00000002") + b"\x00" * 24)
+    assert get_macho_platform(universal) is None
+
+    assert get_macho_platform(tmp_path / "missing") is None
+
+
 def has_idat():
     if "HCLI_HAS_IDAT" not in os.environ:
         return True
@@ -87,3 +140,18 @@ def test_find_current_ida_version():
     result = find_current_ida_version()
     assert isinstance(result, str)
     assert result in ["9.0", "9.1", "9.2"]
+
+
+@pytest.mark.unit
+def test_write_current_ida_cache(tmp_path):
+    cache_path = tmp_path / "platform.json"
+
+    _write_current_ida_cache(cache_path, {"/opt/ida": "linux"})
+    _write_current_ida_cache(cache_path, {"/opt/ida": "mac-arm64"})
+    assert _read_current_ida_cache(cache_path) == {"/opt/ida": "mac-arm64"}
+
+    # a failed write leaves the previous document and no temp file behind
+    with pytest.raises(TypeError):
+        _write_current_ida_cache(cache_path, {"/opt/ida": object()})  # type: ignore[dict-item]
+    assert _read_current_ida_cache(cache_path) == {"/opt/ida": "mac-arm64"}
+    assert [p.name for p in tmp_path.iterdir()] == ["platform.json"]
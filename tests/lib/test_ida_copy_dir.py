@@ -0,0 +1,114 @@
+"""Tests for copying IDA installation trees."""
+
+import errno
+import os
+import shutil
+
+import pytest
+
+from hcli.lib.ida import _copy_dir
+from hcli.lib.util.io import NoSpaceError
+
+
+def make_tree(root):
+    (root / "Versions" / "A").mkdir(parents=True)
+    (root / "Versions" / "A" / "lib.dylib").write_text("lib")
+    (root / "Versions" / "Current").symlink_to("A")
+    (root / "lib.dylib").symlink_to("Versions/Current/lib.dylib")
+    (root / "dangling").symlink_to("missing")
+    (root / "ida.hlp").write_text("help")
+
+
+@pytest.mark.unit
+def test_copy_dir(tmp_path):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+    make_tree(src)
+
+    _copy_dir(src, dest)
+
+    assert (dest / "ida.hlp").read_text() == "help"
+    assert (dest / "Versions" / "A" / "lib.dylib").read_text() == "lib"
+
+    # symlinked directories stay links, rather than being duplicated
+    assert (dest / "Versions" / "Current").is_symlink()
+    assert os.readlink(dest / "Versions" / "Current") == "A"
+    assert (dest / "lib.dylib").is_symlink()
+    assert (dest / "lib.dylib").read_text() == "lib"
+
+    # dangling links are copied as-is instead of failing the copy
+    assert (dest / "dangling").is_symlink()
+    assert os.readlink(dest / "dangling") == "missing"
+
+
+@pytest.mark.unit
+def test_copy_dir_no_space(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+    make_tree(src)
+
+    def copy2(src, dst):
+        with open(dst, "w") as f:
+            f.write("partial")
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+    monkeypatch.setattr(shutil, "copy2", copy2)
+
+    with pytest.raises(NoSpaceError):
+        _copy_dir(src, dest)
+
+    # the partially written file is removed
+    assert not [p for p in dest.rglob("*") if p.is_file() and not p.is_symlink()]
+
+
+@pytest.mark.unit
+def test_copy_dir_link(tmp_path):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+    make_tree(src)
+
+    _copy_dir(src, dest, link=True)
+
+    assert (dest / "ida.hlp").stat().st_ino == (src / "ida.hlp").stat().st_ino
+
+    # same tree as a plain copy: links stay links
+    assert os.readlink(dest / "Versions" / "Current") == "A"
+    assert os.readlink(dest / "dangling") == "missing"
+    assert (dest / "lib.dylib").read_text() == "lib"
+
+
+@pytest.mark.unit
+def test_copy_dir_link_falls_back_to_copy(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+    make_tree(src)
+
+    def link(src, dst, **kwargs):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    monkeypatch.setattr(os, "link", link)
+
+    _copy_dir(src, dest, link=True)
+
+    assert (dest / "ida.hlp").read_text() == "help"
+    assert (dest / "ida.hlp").stat().st_ino != (src / "ida.hlp").stat().st_ino
+    assert os.readlink(dest / "Versions" / "Current") == "A"
+
+
+@pytest.mark.unit
+def test_copy_dir_link_fallback_no_space(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+    make_tree(src)
+
+    def link(src, dst, **kwargs):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    def copy2(src, dst):
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+    monkeypatch.setattr(os, "link", link)
+    monkeypatch.setattr(shutil, "copy2", copy2)
+
+    with pytest.raises(NoSpaceError):
+        _copy_dir(src, dest, link=True)
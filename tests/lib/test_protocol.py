@@ -0,0 +1,39 @@
+"""Tests for ida:// protocol handler registration helpers."""
+
+import stat
+
+import pytest
+
+from hcli.lib.ida.protocol import _write_if_changed
+
+
+def mode_of(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+@pytest.mark.unit
+def test_write_if_changed(tmp_path):
+    path = tmp_path / "hcli-url-handler.desktop"
+
+    # new file
+    assert _write_if_changed(path, "a", mode=0o755)
+    assert path.read_text() == "a"
+    assert mode_of(path) == 0o755
+
+    # unchanged content
+    assert not _write_if_changed(path, "a", mode=0o755)
+
+    # changed content
+    assert _write_if_changed(path, "b", mode=0o755)
+    assert path.read_text() == "b"
+
+
+@pytest.mark.unit
+def test_write_if_changed_fixes_mode(tmp_path):
+    path = tmp_path / "hcli-url-handler.desktop"
+    path.write_text("a")
+    path.chmod(0o600)
+
+    assert not _write_if_changed(path, "a", mode=0o755)
+    assert path.read_text() == "a"
+    assert mode_of(path) == 0o755